@@ -4,6 +4,8 @@ import json
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, simpledialog
 import time
+import copy
+import codecs
 
 
 class SeegaClient:
@@ -11,11 +13,21 @@ class SeegaClient:
         self.host = host
         self.port = port
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.send_lock = threading.Lock()  # Comandos (Tkinter) e pongs (recepção) usam o mesmo socket
         self.player_id = None
         self.nickname = None
         self.current_turn = 0
         self.selected_piece = None
         self.game_state = None
+
+        # Previsão local: comandos enviados e ainda não confirmados pelo servidor
+        self.pending_commands = []
+        self.rolled_back = {}  # Previsões desfeitas que ainda aguardam ack ou reject
+        self.next_command_id = 0
+        self.server_state = None  # Último estado autoritativo recebido
+        self.forced_piece = None  # Peça que deve continuar após captura (previsto)
+        self.confirmed_forced_piece = None
+        self.PREDICTION_TIMEOUT_MS = 3000
         
         # Configurações visuais
         self.CELL_SIZE = 80
@@ -53,6 +65,13 @@ class SeegaClient:
             messagebox.showerror("Erro de Conexão", f"Não foi possível conectar ao servidor: {e}")
             self.root.destroy()
     
+    def send_message(self, message):
+        """
+        Envia uma mensagem inteira ao servidor, sem misturá-la com envios de outra thread.
+        """
+        with self.send_lock:
+            self.socket.sendall(message)
+
     def setup_ui(self):
         main_frame = tk.Frame(self.root)
         main_frame.pack(padx=10, pady=10)
@@ -215,9 +234,176 @@ class SeegaClient:
         command = {
             'type': 'pass'
         }
-        self.socket.send(json.dumps(command).encode('utf-8'))
+        predicted = copy.deepcopy(self.game_state)
+        predicted['current_turn'] = 1 - self.player_id
+        self.send_predicted_command(command, predicted, None)
         self.pass_button.config(state=tk.DISABLED)
 
+    def predict_placement(self, row, col):
+        """
+        Espelho das regras de colocação do servidor.
+        Retorna o estado previsto ou None se a jogada for inválida.
+        """
+        state = self.game_state
+        if state['phase'] != 'placement' or (row == 2 and col == 2):
+            return None
+        if state['board'][row][col] != 0:
+            return None
+
+        predicted = copy.deepcopy(state)
+        predicted['board'][row][col] = self.player_id + 1
+        predicted['pieces_placed'][self.player_id] += 1
+
+        # Todas as peças colocadas: começa a movimentação sem trocar o turno
+        if sum(predicted['pieces_placed']) == 24:
+            predicted['phase'] = 'movement'
+            predicted['board'][2][2] = 0
+            return predicted
+
+        # Cada jogador coloca 2 peças por turno
+        if predicted['pieces_placed'][self.player_id] % 2 == 0:
+            predicted['current_turn'] = 1 - self.player_id
+        return predicted
+
+    def predict_move(self, from_row, from_col, to_row, to_col):
+        """
+        Espelho das regras de movimento e captura do servidor.
+        Retorna (estado previsto, peça forçada) ou None se o movimento for inválido.
+        """
+        state = self.game_state
+        if state['phase'] != 'movement':
+            return None
+        if self.forced_piece is not None and (from_row, from_col) != self.forced_piece:
+            return None
+
+        board = state['board']
+        player_piece = self.player_id + 1
+        if board[from_row][from_col] != player_piece or board[to_row][to_col] != 0:
+            return None
+        if abs(from_row - to_row) + abs(from_col - to_col) != 1:
+            return None
+
+        predicted = copy.deepcopy(state)
+        board = predicted['board']
+        board[from_row][from_col] = 0
+        board[to_row][to_col] = player_piece
+
+        opponent = 1 - self.player_id
+        opponent_piece = opponent + 1
+        captures = 0
+        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            adj_row, adj_col = to_row + dr, to_col + dc
+            next_row, next_col = adj_row + dr, adj_col + dc
+            if (adj_row, adj_col) == (2, 2):
+                continue  # Peça no centro não pode ser capturada
+            if 0 <= next_row < 5 and 0 <= next_col < 5 and board[adj_row][adj_col] == opponent_piece:
+                if board[next_row][next_col] == player_piece:
+                    board[adj_row][adj_col] = 0
+                    captures += 1
+
+        # Fim de jogo por peças eliminadas ou bloqueio do oponente
+        opponent_can_move = any(
+            board[row][col] == opponent_piece and 0 <= row + dr < 5 and 0 <= col + dc < 5
+            and board[row + dr][col + dc] == 0
+            for row in range(5) for col in range(5)
+            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        )
+        if not opponent_can_move:
+            predicted['game_over'] = True
+            predicted['winner'] = self.player_id
+
+        if captures > 0:
+            predicted['captured'][self.player_id] += captures
+            return predicted, (to_row, to_col)
+
+        predicted['current_turn'] = opponent
+        return predicted, None
+
+    def send_predicted_command(self, command, predicted, forced_piece):
+        """
+        Envia um comando marcado com um id e aplica a previsão localmente,
+        sem esperar a resposta do servidor.
+        """
+        command_id = self.next_command_id
+        self.next_command_id += 1
+        command['id'] = command_id
+
+        self.pending_commands.append({
+            'id': command_id,
+            'predicted': predicted,
+            'forced_piece': forced_piece
+        })
+        self.send_message(json.dumps(command).encode('utf-8'))
+
+        self.forced_piece = forced_piece
+        self.update_game_state(predicted)
+        self.root.after(self.PREDICTION_TIMEOUT_MS, self.expire_prediction, command_id)
+
+    def reconcile_game_state(self, state):
+        """
+        Recebe o estado autoritativo do servidor.
+        Enquanto houver previsões aguardando ack, a previsão mais recente continua na tela.
+        """
+        self.server_state = state
+
+        # Ao trocar de turno (ou no fim do jogo) não há mais peça forçada
+        if state['current_turn'] != self.player_id or state['game_over']:
+            self.confirmed_forced_piece = None
+
+        if not self.pending_commands:
+            self.forced_piece = self.confirmed_forced_piece
+            self.update_game_state(state)
+
+    def confirm_prediction(self, command_id):
+        """
+        O servidor confirmou o comando (ack): a peça forçada vem da previsão correspondente.
+        Um ack que chega depois do timeout também vale.
+        """
+        for index, pending in enumerate(self.pending_commands):
+            if pending['id'] == command_id:
+                del self.pending_commands[:index + 1]
+                break
+        else:
+            pending = self.rolled_back.pop(command_id, None)
+            if pending is None:
+                return
+
+        self.confirmed_forced_piece = pending['forced_piece']
+        if not self.pending_commands:
+            self.forced_piece = self.confirmed_forced_piece
+
+    def reject_prediction(self, command_id, reason):
+        """
+        Desfaz a previsão recusada pelo servidor (e as que dependiam dela).
+        """
+        if self.rolled_back.pop(command_id, None) is not None:
+            return  # Previsão já desfeita
+        if any(pending['id'] == command_id for pending in self.pending_commands):
+            self.add_system_message(f"Jogada recusada pelo servidor: {reason}")
+            self.rollback()
+            self.rolled_back.pop(command_id, None)
+
+    def expire_prediction(self, command_id):
+        """
+        Desfaz a previsão se o servidor não a confirmou a tempo.
+        """
+        if any(pending['id'] == command_id for pending in self.pending_commands):
+            self.add_system_message("Jogada não confirmada pelo servidor.")
+            self.rollback()
+
+    def rollback(self):
+        """
+        Descarta as previsões pendentes e volta ao último estado do servidor.
+        Os comandos descartados ainda podem receber ack ou reject do servidor.
+        """
+        for pending in self.pending_commands:
+            self.rolled_back[pending['id']] = pending
+        self.pending_commands = []
+        self.selected_piece = None
+        self.forced_piece = self.confirmed_forced_piece
+        if self.server_state is not None:
+            self.update_game_state(self.server_state)
+
     def on_canvas_click(self, event):
         if not self.game_state or self.game_state['game_over']:
             return
@@ -265,8 +451,8 @@ class SeegaClient:
                 elif self.game_state['board'][row][col] == 0:
                     # Verifica se é um movimento válido (apenas uma casa ortogonalmente)
                     if (abs(from_row - row) == 1 and from_col == col) or (abs(from_col - col) == 1 and from_row == row):
-                        self.send_move_command(from_row, from_col, row, col)
                         self.selected_piece = None
+                        self.send_move_command(from_row, from_col, row, col)
                 
                 # Clicou em outra peça própria, muda seleção
                 elif self.game_state['board'][row][col] == player_piece:
@@ -274,14 +460,22 @@ class SeegaClient:
                     self.draw_board()
     
     def send_place_command(self, row, col):
+        predicted = self.predict_placement(row, col)
+        if predicted is None:
+            return
+
         command = {
             'type': 'place',
             'row': row,
             'col': col
         }
-        self.socket.send(json.dumps(command).encode('utf-8'))
+        self.send_predicted_command(command, predicted, None)
     
     def send_move_command(self, from_row, from_col, to_row, to_col):
+        prediction = self.predict_move(from_row, from_col, to_row, to_col)
+        if prediction is None:
+            return
+
         command = {
             'type': 'move',
             'from_row': from_row,
@@ -289,7 +483,8 @@ class SeegaClient:
             'to_row': to_row,
             'to_col': to_col
         }
-        self.socket.send(json.dumps(command).encode('utf-8'))
+        predicted, forced_piece = prediction
+        self.send_predicted_command(command, predicted, forced_piece)
     
     def send_chat_message(self):
         message = self.msg_entry.get().strip()
@@ -298,7 +493,7 @@ class SeegaClient:
                 'type': 'chat',
                 'message': message
             }
-            self.socket.send(json.dumps(command).encode('utf-8'))
+            self.send_message(json.dumps(command).encode('utf-8'))
             self.msg_entry.delete(0, tk.END)
     
     def add_chat_message(self, sender, message):
@@ -318,12 +513,19 @@ class SeegaClient:
             command = {
                 'type': 'surrender'
             }
-            self.socket.send(json.dumps(command).encode('utf-8'))
+            self.send_message(json.dumps(command).encode('utf-8'))
     
     def receive_messages(self):
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+
         while True:
             try:
-                message = self.socket.recv(1024).decode('utf-8')
+                chunk = self.socket.recv(1024)
+                if not chunk:
+                    raise ConnectionError("Servidor encerrou a conexão")
+                message = utf8.decode(chunk)
 
                 if message == 'NICK':
                     try:
@@ -333,7 +535,7 @@ class SeegaClient:
                             if not nickname:
                                 nickname = f"Jogador{round(time.time())}"
                             self.nickname = nickname
-                            self.socket.send(nickname.encode('utf-8'))
+                            self.send_message(nickname.encode('utf-8'))
 
                         # Executa na thread principal do Tkinter
                         self.root.after(0, ask_nick)
@@ -350,32 +552,56 @@ class SeegaClient:
 
 
                 else:
-                    try:
-                        data = json.loads(message)
-                        
-                        if data['type'] == 'player_info':
-                            self.player_id = data['player_id']
-                            self.root.title(f"Seega - {self.nickname}")
-                            piece_color = "Preto" if self.player_id == 0 else "Branco"
-                            self.add_system_message(f"Você é o jogador {self.player_id + 1} ({piece_color})")
-                        
-                        elif data['type'] == 'chat':
-                            self.add_chat_message(data['sender'], data['message'])
-                        
-                        elif data['type'] == 'system_message':
-                            self.add_system_message(data['message'])
-                        
-                        elif data['type'] == 'game_state':
-                            self.update_game_state(data['state'])
-                    
-                    except json.JSONDecodeError:
-                        self.add_system_message(f"Mensagem inválida recebida: {message}")
+                    # Várias mensagens podem chegar juntas no mesmo recv
+                    buffer += message
+                    while True:
+                        buffer = buffer.lstrip()
+                        if not buffer:
+                            break
+                        try:
+                            data, end = decoder.raw_decode(buffer)
+                        except json.JSONDecodeError:
+                            # Mensagem incompleta, aguarda o restante
+                            if len(buffer) > 65536:
+                                self.add_system_message(f"Mensagem inválida recebida: {buffer[:200]}")
+                                buffer = ''
+                            break
+                        buffer = buffer[end:]
+                        self.handle_message(data)
             
             except Exception as e:
                 print(f"Erro: {e}")
                 messagebox.showerror("Erro de Conexão", "Conexão com o servidor perdida!")
                 self.root.destroy()
                 break
+
+    def handle_message(self, data):
+        if data['type'] == 'player_info':
+            self.player_id = data['player_id']
+            self.root.title(f"Seega - {self.nickname}")
+            piece_color = "Preto" if self.player_id == 0 else "Branco"
+            self.add_system_message(f"Você é o jogador {self.player_id + 1} ({piece_color})")
+
+        elif data['type'] == 'chat':
+            self.add_chat_message(data['sender'], data['message'])
+
+        elif data['type'] == 'system_message':
+            self.add_system_message(data['message'])
+
+        elif data['type'] == 'game_state':
+            # Reconciliação na thread principal do Tkinter
+            self.root.after(0, self.reconcile_game_state, data['state'])
+
+        elif data['type'] == 'ping':
+            # Heartbeat: responde para o servidor saber que a conexão está ativa
+            self.send_message(json.dumps({'type': 'pong'}).encode('utf-8'))
+
+        elif data['type'] == 'ack':
+            self.root.after(0, self.confirm_prediction, data['id'])
+
+        elif data['type'] == 'reject':
+            # O servidor recusou o comando: desfaz a previsão sem esperar o timeout
+            self.root.after(0, self.reject_prediction, data['id'], data.get('reason'))
     
     def run(self):
         self.root.mainloop()
@@ -1,39 +1,175 @@
 import socket
 import threading
 import json
+import codecs
+import copy
+import math
 import random
 import time
 
 
-class SeegaServer:
+def decode_messages(buffer):
     """
-    Classe que implementa o servidor do jogo Seega com suporte para dois jogadores.
-    Gerencia conexões, estado do jogo, comunicação e lógica do jogo.
+    Separa as mensagens JSON completas do início do buffer.
+    Retorna a lista de mensagens e o texto que sobrou (mensagem incompleta).
+    Um trecho que não é JSON válido vira None na lista e é descartado até o próximo '{'.
     """
+    decoder = json.JSONDecoder()
+    messages = []
 
-    def __init__(self, host='localhost', port=5556):
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer:
+            return messages, buffer
+        try:
+            data, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            # Erro no fim do buffer (ou string/literal cortado): aguarda o restante
+            tail = buffer[e.pos:]
+            if (e.pos >= len(buffer) or e.msg.startswith('Unterminated string')
+                    or any(literal.startswith(tail) for literal in ('true', 'false', 'null'))):
+                return messages, buffer
+            messages.append(None)
+            next_message = buffer.find('{', 1)
+            buffer = buffer[next_message:] if next_message != -1 else ''
+            continue
+        messages.append(data)
+        buffer = buffer[end:]
+
+
+class Timer:
+    """
+    Temporizador agendado na TimerWheel. Guarda a função a chamar e o slot onde está.
+    """
+
+    def __init__(self, expires, callback, args):
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.slot = None  # Conjunto (slot da roda) que contém o temporizador
+
+
+class TimerWheel:
+    """
+    Roda de temporizadores hierárquica: agendar e cancelar custam O(1).
+    Uma única thread avança a roda a cada tick e executa os temporizadores vencidos,
+    então milhares de temporizadores não criam threads nem laços de espera extras.
+    """
+
+    def __init__(self, tick=0.1, slots=64, levels=4):
         """
-        Inicializa o servidor socket e o estado do jogo.
+        tick é a resolução em segundos; cada nível cobre slots vezes o intervalo do anterior.
         """
-        self.host = host
-        self.port = port
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self.wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self.current_tick = 0
+        self.running = False
+        self.lock = threading.Lock()
+
+    def schedule(self, delay, callback, *args):
+        """
+        Agenda callback(*args) para daqui a delay segundos e retorna o temporizador.
+        """
+        with self.lock:
+            ticks = max(1, math.ceil(delay / self.tick))
+            ticks = min(ticks, self.slots ** self.levels - 1)
+            timer = Timer(self.current_tick + ticks, callback, args)
+            self._insert(timer)
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancela um temporizador ainda não executado.
+        """
+        if timer is None:
+            return
+        with self.lock:
+            if timer.slot is not None:
+                timer.slot.discard(timer)
+                timer.slot = None
 
-        # Cria um socket TCP
-        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    def _insert(self, timer):
+        """
+        Coloca o temporizador no nível cujo alcance cobre o tempo restante.
+        """
+        delta = timer.expires - self.current_tick
+        level = 0
+        while level < self.levels - 1 and delta >= self.slots ** (level + 1):
+            level += 1
+        slot = self.wheels[level][(timer.expires // self.slots ** level) % self.slots]
+        slot.add(timer)
+        timer.slot = slot
+
+    def advance(self):
+        """
+        Avança um tick: redistribui os níveis superiores e executa os temporizadores vencidos.
+        """
+        with self.lock:
+            self.current_tick += 1
+
+            # Desce os temporizadores dos níveis superiores, do mais alto para o mais baixo
+            for level in range(self.levels - 1, 0, -1):
+                span = self.slots ** level
+                if self.current_tick % span == 0:
+                    index = (self.current_tick // span) % self.slots
+                    cascading = self.wheels[level][index]
+                    self.wheels[level][index] = set()
+                    for timer in cascading:
+                        self._insert(timer)
+
+            index = self.current_tick % self.slots
+            expired = self.wheels[0][index]
+            self.wheels[0][index] = set()
+            for timer in expired:
+                timer.slot = None
+
+        # Executa fora do lock para que os callbacks possam agendar novos temporizadores
+        for timer in expired:
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"Erro no temporizador: {e}")
 
-        # Permite reutilizar o mesmo endereço e porta imediatamente após o encerramento do servidor
-        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    def run(self):
+        """
+        Avança a roda em tempo real até stop() ser chamado.
+        """
+        self.running = True
+        next_tick = time.monotonic() + self.tick
+        while self.running:
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # Recupera ticks atrasados sem acumular desvio
+            while self.running and time.monotonic() >= next_tick:
+                self.advance()
+                next_tick += self.tick
+
+    def stop(self):
+        """
+        Interrompe o laço de run().
+        """
+        self.running = False
 
-        # Associa o socket ao endereço IP e porta especificados
-        self.server.bind((self.host, self.port))
 
-        # Coloca o socket em modo de escuta, aceitando até 2 conexões pendentes
-        self.server.listen(2)
+class SeegaGame:
+    """
+    Regras e estado de uma partida de Seega, sem rede.
+    O servidor e o torneio de bots usam esta classe para aplicar as jogadas.
+    """
 
-        # Listas para armazenar conexões e apelidos dos jogadores
-        self.clients = []
-        self.nicknames = []
+    def __init__(self):
+        """
+        Inicializa o estado de uma nova partida.
+        """
+        self.reset_game()
 
+    def reset_game(self):
+        """
+        Reinicia o estado do jogo para uma nova partida.
+        """
         # Conta quantas peças o jogador atual colocou nesta rodada
         self.placement_counter = 0
 
@@ -60,125 +196,141 @@ class SeegaServer:
         # Centro do tabuleiro inicialmente bloqueado
         self.game_state['board'][2][2] = -1
 
-        print(f"Servidor inicializado em {host}:{port}")
-        print("Aguardando jogadores...")
+    def apply_command(self, data, player_id):
+        """
+        Aplica um comando de jogo sem enviar o estado.
+        Retorna None se o comando foi aplicado ou o motivo da recusa.
+        """
+        reason = self.validate_command(data)
+        if reason is not None:
+            return reason
+        if self.game_state['game_over']:
+            return 'game_over'
+        if player_id != self.game_state['current_turn']:
+            return 'not_your_turn'
+
+        if data['type'] == 'place':
+            return self.handle_placement(data, player_id)
+        if data['type'] == 'move':
+            return self.handle_move(data, player_id)
 
-    def broadcast(self, message):
+        if self.game_state['phase'] != 'movement':
+            return 'wrong_phase'
+        self.forced_piece = None  # limpa peça forçada
+        self.game_state['current_turn'] = 1 - player_id
+        return None
+
+    def validate_command(self, data):
         """
-        Envia uma mensagem para todos os clientes conectados.
+        Verifica o formato de um comando de jogo antes de aplicá-lo.
+        Retorna None se o formato estiver correto ou o motivo da recusa.
         """
-        for client in self.clients:
-            try:
-                client.send(message)
-            except:
-                index = self.clients.index(client)
-                self.clients.remove(client)
-                client.close()
-                nickname = self.nicknames[index]
-                self.nicknames.remove(nickname)
+        if not isinstance(data, dict):
+            return 'malformed'
 
-    def handle_client(self, client, nickname, player_id):
+        fields = {
+            'place': ('row', 'col'),
+            'move': ('from_row', 'from_col', 'to_row', 'to_col'),
+            'pass': ()
+        }
+        if data.get('type') not in fields:
+            return 'unknown_command'
+
+        for field in fields[data['type']]:
+            value = data.get(field)
+            # bool é subclasse de int, mas não é uma coordenada
+            if not isinstance(value, int) or isinstance(value, bool):
+                return 'malformed'
+        return None
+
+    def apply_batch(self, commands, player_id):
         """
-        Processa mensagens recebidas de um cliente específico.
+        Aplica uma lista de comandos como uma unidade: se algum for recusado,
+        o estado volta ao que era antes do lote.
+        Retorna o motivo da recusa (ou None) e o resultado de cada comando.
         """
-        while True:
-            try:
-                message = client.recv(1024)
-                if not message:
-                    break
+        # Lote vazio não muda o estado e não pode contar como jogada
+        if not isinstance(commands, list) or not commands:
+            return 'malformed', []
 
-                data = json.loads(message.decode('utf-8'))
-
-                # Mensagem de chat
-                if data['type'] == 'chat':
-                    chat_msg = {
-                        'type': 'chat',
-                        'sender': nickname,
-                        'message': data['message']
-                    }
-                    self.broadcast(json.dumps(chat_msg).encode('utf-8'))
-
-                # Jogada de movimento
-                elif data['type'] == 'move':
-                    if player_id == self.game_state['current_turn']:
-                        self.handle_move(data, player_id)
-
-                # Colocação de peça
-                elif data['type'] == 'place':
-                    if player_id == self.game_state['current_turn']:
-                        self.handle_placement(data, player_id)
-
-                # Rendição
-                elif data['type'] == 'surrender':
-                    self.game_state['game_over'] = True
-                    self.game_state['winner'] = 1 if player_id == 0 else 0
-                    self.broadcast_game_state()
+        snapshot = (copy.deepcopy(self.game_state), self.placement_counter, self.forced_piece)
+        results = []
+        failed = None
 
-                # Passar turno
-                elif data['type'] == 'pass':
-                    if player_id == self.game_state['current_turn'] and self.game_state['phase'] == 'movement':
-                        self.forced_piece = None  # limpa peça forçada
-                        self.game_state['current_turn'] = 1 - player_id
-                        self.broadcast_game_state()
+        def command_id(command):
+            return command.get('id') if isinstance(command, dict) else None
 
+        for command in commands:
+            try:
+                reason = self.apply_command(command, player_id)
             except Exception as e:
-                print(f"Erro: {e}")
+                print(f"Erro no lote: {e}")
+                reason = 'malformed'
+            if reason is not None:
+                failed = reason
+                results.append({'id': command_id(command), 'status': 'rejected', 'reason': reason})
                 break
+            results.append({'id': command_id(command), 'status': 'ok'})
 
-        # Remoção do cliente desconectado
-        if client in self.clients:
-            index = self.clients.index(client)
-            self.clients.remove(client)
-            client.close()
-            nickname = self.nicknames[index]
-            self.nicknames.remove(nickname)
+        if failed is None:
+            return None, results
 
-            # Encerrar o jogo se um jogador sair
-            if len(self.clients) < 2:
-                self.game_state['game_over'] = True
-                self.game_state['winner'] = 1 if player_id == 0 else 0
-                self.broadcast_game_state()
+        # Desfaz os comandos já aplicados e recusa o lote inteiro
+        self.game_state, self.placement_counter, self.forced_piece = snapshot
+        for result in results[:-1]:
+            result['status'] = 'rejected'
+            result['reason'] = 'batch_aborted'
+        for command in commands[len(results):]:
+            results.append({'id': command_id(command), 'status': 'rejected', 'reason': 'batch_aborted'})
+        return failed, results
 
     def handle_placement(self, data, player_id):
         """
         Processa a colocação de uma peça no tabuleiro.
         Agora cada jogador pode colocar 2 peças seguidas antes de passar o turno.
+        Retorna None se a peça foi colocada ou o motivo da recusa.
         """
         row, col = data['row'], data['col']
 
-        if self.game_state['phase'] == 'placement':
-            if row == 2 and col == 2:
-                return  # Centro não pode ser usado nessa fase
-
-            if self.game_state['board'][row][col] == 0 and player_id == self.game_state['current_turn']:
-                player_piece = player_id + 1
-                self.game_state['board'][row][col] = player_piece
-                self.game_state['pieces_placed'][player_id] += 1
-                self.placement_counter += 1
-
-                # Verifica se todas as peças foram colocadas
-                total_pieces = sum(self.game_state['pieces_placed'])
-                if total_pieces == 24:
-                    self.game_state['phase'] = 'movement'
-                    self.game_state['board'][2][2] = 0  # Libera o centro
-                    self.placement_counter = 0  # resetar para segurança
-                    self.broadcast_game_state()
-                    return
+        if self.game_state['phase'] != 'placement':
+            return 'wrong_phase'
+        if not (0 <= row < 5 and 0 <= col < 5):
+            return 'out_of_bounds'
+        if row == 2 and col == 2:
+            return 'center_blocked'  # Centro não pode ser usado nessa fase
+        if self.game_state['board'][row][col] != 0:
+            return 'occupied'
+        if player_id != self.game_state['current_turn']:
+            return 'not_your_turn'
 
-                # Após 2 peças, passa o turno
-                if self.placement_counter == 2:
-                    self.placement_counter = 0
-                    self.game_state['current_turn'] = 1 - self.game_state['current_turn']
+        player_piece = player_id + 1
+        self.game_state['board'][row][col] = player_piece
+        self.game_state['pieces_placed'][player_id] += 1
+        self.placement_counter += 1
 
-                self.broadcast_game_state()
+        # Verifica se todas as peças foram colocadas
+        total_pieces = sum(self.game_state['pieces_placed'])
+        if total_pieces == 24:
+            self.game_state['phase'] = 'movement'
+            self.game_state['board'][2][2] = 0  # Libera o centro
+            self.placement_counter = 0  # resetar para segurança
+            return None
+
+        # Após 2 peças, passa o turno
+        if self.placement_counter == 2:
+            self.placement_counter = 0
+            self.game_state['current_turn'] = 1 - self.game_state['current_turn']
+
+        return None
 
     def handle_move(self, data, player_id):
         """
         Processa o movimento de uma peça no tabuleiro.
         Jogador continua jogando se capturar, mas deve continuar com a mesma peça.
+        Retorna None se o movimento foi feito ou o motivo da recusa.
         """
         if self.game_state['phase'] != 'movement':
-            return
+            return 'wrong_phase'
 
         from_row = data['from_row']
         from_col = data['from_col']
@@ -186,38 +338,43 @@ class SeegaServer:
         to_col = data['to_col']
         player_piece = player_id + 1
 
+        if not all(0 <= value < 5 for value in (from_row, from_col, to_row, to_col)):
+            return 'out_of_bounds'
+
         # Se houver peça forçada, só pode mover ela
         if self.forced_piece is not None:
             forced_row, forced_col = self.forced_piece
             if (from_row, from_col) != (forced_row, forced_col):
-                return  # Movimento inválido com peça diferente
+                return 'forced_piece'  # Movimento inválido com peça diferente
 
-        if self.is_valid_move(from_row, from_col, to_row, to_col, player_piece):
-            self.game_state['board'][from_row][from_col] = 0
-            self.game_state['board'][to_row][to_col] = player_piece
+        if not self.is_valid_move(from_row, from_col, to_row, to_col, player_piece):
+            return 'invalid_move'
 
-            captures = self.check_captures(to_row, to_col, player_piece)
-            opponent = 1 - player_id
-            opponent_piece = opponent + 1
+        self.game_state['board'][from_row][from_col] = 0
+        self.game_state['board'][to_row][to_col] = player_piece
 
-            # Verifica fim de jogo por peças eliminadas
-            if sum(row.count(opponent_piece) for row in self.game_state['board']) == 0:
-                self.game_state['game_over'] = True
-                self.game_state['winner'] = player_id
+        captures = self.check_captures(to_row, to_col, player_piece)
+        opponent = 1 - player_id
+        opponent_piece = opponent + 1
 
-            # Verifica bloqueio de movimentos
-            if not self.has_valid_moves(opponent_piece):
-                self.game_state['game_over'] = True
-                self.game_state['winner'] = player_id
+        # Verifica fim de jogo por peças eliminadas
+        if sum(row.count(opponent_piece) for row in self.game_state['board']) == 0:
+            self.game_state['game_over'] = True
+            self.game_state['winner'] = player_id
 
-            if captures > 0:
-                self.game_state['captured'][player_id] += captures
-                self.forced_piece = (to_row, to_col)  # Jogador continua com esta peça
-            else:
-                self.forced_piece = None
-                self.game_state['current_turn'] = opponent
+        # Verifica bloqueio de movimentos
+        if not self.has_valid_moves(opponent_piece):
+            self.game_state['game_over'] = True
+            self.game_state['winner'] = player_id
 
-            self.broadcast_game_state()
+        if captures > 0:
+            self.game_state['captured'][player_id] += captures
+            self.forced_piece = (to_row, to_col)  # Jogador continua com esta peça
+        else:
+            self.forced_piece = None
+            self.game_state['current_turn'] = opponent
+
+        return None
 
     def is_valid_move(self, from_row, from_col, to_row, to_col, player_piece):
         """
@@ -277,9 +434,315 @@ class SeegaServer:
                                 return True
         return False
 
-    def broadcast_game_state(self):
+
+class SeegaServer(SeegaGame):
+    """
+    Classe que implementa o servidor do jogo Seega com suporte para dois jogadores.
+    Gerencia conexões, estado do jogo, comunicação e lógica do jogo.
+    """
+
+    def __init__(self, host='localhost', port=5556):
+        """
+        Inicializa o servidor socket e o estado do jogo.
+        """
+        self.host = host
+        self.port = port
+
+        # Cria um socket TCP
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        # Permite reutilizar o mesmo endereço e porta imediatamente após o encerramento do servidor
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        # Associa o socket ao endereço IP e porta especificados
+        self.server.bind((self.host, self.port))
+
+        # Coloca o socket em modo de escuta, aceitando até 2 conexões pendentes
+        self.server.listen(2)
+
+        # Listas para armazenar conexões e apelidos dos jogadores
+        self.clients = []
+        self.nicknames = []
+
+        # Garante que cada comando (ou lote) seja aplicado sem interferência da outra thread
+        self.lock = threading.Lock()
+
+        # Temporizadores: heartbeats, conexões inativas e relógio de turno
+        self.timers = TimerWheel()
+        self.HEARTBEAT_INTERVAL = 5  # Segundos entre pings
+        self.IDLE_TIMEOUT = 15  # Desconecta quem não responde por esse tempo
+        self.SEND_TIMEOUT = 5  # Limite de um envio para um cliente que não lê o socket
+        self.TURN_TIMEOUT = 60  # Tempo máximo de cada jogada
+        self.MAX_TIMEOUTS = 3  # Tempos esgotados seguidos antes de perder a partida
+        self.GAME_OVER_GRACE = 60  # Tempo até encerrar a partida terminada
+        self.connection_timers = {}
+        self.send_locks = {}  # Um lock por conexão para não misturar mensagens no socket
+        self.turn_timer = None
+        self.turn_clock_generation = 0
+        self.timeouts = [0, 0]
+        self.clocked_state = None  # Estado em que o relógio do turno foi iniciado
+        self.cleanup_timer = None
+
+        super().__init__()
+
+        print(f"Servidor inicializado em {host}:{port}")
+        print("Aguardando jogadores...")
+
+    def send_to(self, client, message):
+        """
+        Envia uma mensagem completa a um cliente.
+        Pings (thread dos temporizadores) e respostas (thread do cliente) usam o mesmo
+        socket, por isso cada envio é feito inteiro sob o lock da conexão.
+        """
+        lock = self.send_locks.setdefault(client, threading.Lock())
+        with lock:
+            try:
+                client.sendall(message)
+            except socket.timeout:
+                # Cliente parou de ler; um envio parcial corromperia o fluxo, então encerra a conexão
+                self.reap_connection(client)
+                raise
+
+    def broadcast(self, message):
+        """
+        Envia uma mensagem para todos os clientes conectados.
+        """
+        for client in self.clients:
+            try:
+                self.send_to(client, message)
+            except:
+                index = self.clients.index(client)
+                self.clients.remove(client)
+                self.unwatch_connection(client)
+                client.close()
+                nickname = self.nicknames[index]
+                self.nicknames.remove(nickname)
+
+    def watch_connection(self, client):
+        """
+        Agenda o heartbeat e o limite de inatividade de uma conexão.
+        O timeout do socket impede que um envio bloqueie a thread dos temporizadores.
+        """
+        client.settimeout(self.SEND_TIMEOUT)
+        self.connection_timers[client] = {
+            'ping': self.timers.schedule(self.HEARTBEAT_INTERVAL, self.send_ping, client),
+            'idle': self.timers.schedule(self.IDLE_TIMEOUT, self.reap_connection, client)
+        }
+
+    def unwatch_connection(self, client):
+        """
+        Cancela os temporizadores de uma conexão encerrada.
+        """
+        self.send_locks.pop(client, None)
+        timers = self.connection_timers.pop(client, None)
+        if timers:
+            self.timers.cancel(timers['ping'])
+            self.timers.cancel(timers['idle'])
+
+    def touch_connection(self, client):
+        """
+        Reinicia o limite de inatividade ao receber dados do cliente.
+        """
+        timers = self.connection_timers.get(client)
+        if timers:
+            self.timers.cancel(timers['idle'])
+            timers['idle'] = self.timers.schedule(self.IDLE_TIMEOUT, self.reap_connection, client)
+
+    def send_ping(self, client):
+        """
+        Envia um ping ao cliente e agenda o próximo.
+        """
+        timers = self.connection_timers.get(client)
+        if not timers:
+            return
+        try:
+            self.send_to(client, json.dumps({'type': 'ping'}).encode('utf-8'))
+        except:
+            self.reap_connection(client)
+            return
+        timers['ping'] = self.timers.schedule(self.HEARTBEAT_INTERVAL, self.send_ping, client)
+
+    def reap_connection(self, client):
+        """
+        Encerra uma conexão que parou de responder.
+        O recv da thread do cliente falha e a remoção segue o caminho normal.
+        """
+        print("Conexão inativa encerrada")
+        try:
+            client.shutdown(socket.SHUT_RDWR)
+        except:
+            pass
+
+    def restart_turn_clock(self):
+        """
+        Reinicia o relógio do jogador da vez.
+        """
+        self.timers.cancel(self.turn_timer)
+        self.turn_timer = None
+        self.turn_clock_generation += 1
+        if self.game_state['game_over'] or len(self.clients) < 2:
+            return
+        self.turn_timer = self.timers.schedule(self.TURN_TIMEOUT, self.turn_timeout,
+                                               self.game_state['current_turn'], self.turn_clock_generation)
+
+    def turn_timeout(self, player_id, generation):
+        """
+        Tempo de jogada esgotado: passa o turno na movimentação ou dá a vitória ao oponente
+        na colocação (onde não é possível passar) e após muitos tempos esgotados seguidos.
+        """
+        with self.lock:
+            if generation != self.turn_clock_generation or self.game_state['game_over']:
+                return  # Relógio já reiniciado por outra jogada
+
+            self.timeouts[player_id] += 1
+            nickname = self.nicknames[player_id] if player_id < len(self.nicknames) else f"Jogador {player_id + 1}"
+
+            if self.game_state['phase'] == 'movement' and self.timeouts[player_id] < self.MAX_TIMEOUTS:
+                self.forced_piece = None
+                self.game_state['current_turn'] = 1 - player_id
+                message = f"Tempo esgotado! Turno de {nickname} passado."
+            else:
+                self.game_state['game_over'] = True
+                self.game_state['winner'] = 1 - player_id
+                message = f"Tempo esgotado! {nickname} perdeu a partida."
+
+            self.broadcast(json.dumps({
+                'type': 'system_message',
+                'message': message
+            }).encode('utf-8'))
+            self.broadcast_game_state()
+
+    def end_game(self):
+        """
+        Encerra a partida terminada: desconecta os jogadores e para o servidor.
+        """
+        print("Partida encerrada")
+        for client in list(self.clients):
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except:
+                pass
+        self.timers.stop()
+
+    def handle_client(self, client, nickname, player_id):
+        """
+        Processa mensagens recebidas de um cliente específico.
+        Várias mensagens podem chegar juntas no mesmo recv quando o cliente
+        envia comandos em sequência, por isso elas são separadas em um buffer.
+        """
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+
+        while True:
+            try:
+                try:
+                    message = client.recv(1024)
+                except socket.timeout:
+                    continue  # Sem dados por enquanto; a inatividade é tratada pelos temporizadores
+                if not message:
+                    break
+
+                self.touch_connection(client)
+                messages, buffer = decode_messages(buffer + utf8.decode(message))
+                for data in messages:
+                    if data is None:
+                        self.send_reply(client, None, 'malformed')
+                    else:
+                        self.handle_message(client, nickname, player_id, data)
+
+                # Mensagem incompleta grande demais: desiste da conexão
+                if len(buffer) > 65536:
+                    raise ValueError("Mensagem muito grande")
+
+            except Exception as e:
+                print(f"Erro: {e}")
+                break
+
+        # Remoção do cliente desconectado
+        if client in self.clients:
+            index = self.clients.index(client)
+            self.clients.remove(client)
+            self.unwatch_connection(client)
+            client.close()
+            nickname = self.nicknames[index]
+            self.nicknames.remove(nickname)
+
+            # Encerrar o jogo se um jogador sair
+            if len(self.clients) < 2:
+                with self.lock:
+                    self.game_state['game_over'] = True
+                    self.game_state['winner'] = 1 if player_id == 0 else 0
+                    self.broadcast_game_state()
+
+    def handle_message(self, client, nickname, player_id, data):
+        """
+        Trata uma mensagem já decodificada de um cliente.
+        """
+        # Mensagem sem tipo é recusada em vez de derrubar a conexão
+        if not isinstance(data, dict) or not isinstance(data.get('type'), str):
+            self.send_reply(client, data.get('id') if isinstance(data, dict) else None, 'malformed')
+
+        # Mensagem de chat
+        elif data['type'] == 'chat':
+            if not isinstance(data.get('message'), str):
+                self.send_reply(client, data.get('id'), 'malformed')
+                return
+            chat_msg = {
+                'type': 'chat',
+                'sender': nickname,
+                'message': data['message']
+            }
+            self.broadcast(json.dumps(chat_msg).encode('utf-8'))
+
+        # Jogada de movimento, colocação de peça ou passar turno
+        elif data['type'] in ('move', 'place', 'pass'):
+            with self.lock:
+                reason = self.apply_command(data, player_id)
+                self.send_reply(client, data.get('id'), reason)
+                if reason is None:
+                    self.broadcast_game_state(player_id)
+
+        # Lote de comandos aplicados de forma atômica
+        elif data['type'] == 'batch':
+            with self.lock:
+                reason, results = self.apply_batch(data.get('commands'), player_id)
+                self.send_reply(client, data.get('id'), reason, results)
+                if reason is None:
+                    self.broadcast_game_state(player_id)
+
+        # Rendição
+        elif data['type'] == 'surrender':
+            with self.lock:
+                if self.game_state['game_over']:
+                    self.send_reply(client, data.get('id'), 'game_over')
+                    return
+                self.game_state['game_over'] = True
+                self.game_state['winner'] = 1 if player_id == 0 else 0
+                self.send_reply(client, data.get('id'), None)
+                self.broadcast_game_state()
+
+        # Resposta ao heartbeat: basta ter chegado (touch_connection)
+        elif data['type'] == 'pong':
+            pass
+
+        else:
+            self.send_reply(client, data.get('id'), 'unknown_command')
+
+    def send_reply(self, client, request_id, reason, results=None):
+        """
+        Confirma (ack) ou recusa (reject) um comando, identificado pelo id enviado pelo cliente.
+        """
+        reply = {'type': 'ack' if reason is None else 'reject', 'id': request_id}
+        if reason is not None:
+            reply['reason'] = reason
+        if results is not None:
+            reply['results'] = results
+        self.send_to(client, json.dumps(reply).encode('utf-8'))
+
+    def broadcast_game_state(self, player_id=None):
         """
         Envia o estado atual do jogo para todos os clientes.
+        player_id indica quem fez a jogada que levou a este estado, se houver.
         """
         state_message = {
             'type': 'game_state',
@@ -287,34 +750,69 @@ class SeegaServer:
         }
         self.broadcast(json.dumps(state_message).encode('utf-8'))
 
+        # Só uma mudança de estado reinicia o relógio do turno e zera os tempos esgotados
+        if self.game_state != self.clocked_state:
+            self.clocked_state = copy.deepcopy(self.game_state)
+            if player_id is not None:
+                self.timeouts[player_id] = 0
+            self.restart_turn_clock()
+
+        # Partida terminada é encerrada após um tempo, mesmo que os jogadores não saiam
+        if self.game_state['game_over'] and self.cleanup_timer is None:
+            self.cleanup_timer = self.timers.schedule(self.GAME_OVER_GRACE, self.end_game)
+
     def start(self):
         """
         Inicia o servidor e aceita conexões dos dois jogadores.
+        A thread principal passa a executar a roda de temporizadores.
         """
         # Escolhe aleatoriamente quem começa
         self.game_state['current_turn'] = random.randint(0, 1)
 
+        accept_thread = threading.Thread(target=self.accept_players)
+        accept_thread.daemon = True
+        accept_thread.start()
+
+        # Mantém o servidor ativo até a partida ser encerrada ou interrupção manual
+        try:
+            self.timers.run()
+        except KeyboardInterrupt:
+            pass
+        print("Servidor encerrado")
+        self.server.close()
+
+    def accept_players(self):
+        """
+        Aceita conexões até os dois jogadores entrarem.
+        """
         while len(self.clients) < 2:
             client, address = self.server.accept()
             print(f"Conexão estabelecida com {str(address)}")
 
-            client.send('NICK'.encode('utf-8'))
-
+            # Quem não envia o nickname a tempo é desconectado, liberando a thread de aceitação
+            nickname_timer = self.timers.schedule(self.IDLE_TIMEOUT, self.reap_connection, client)
             try:
+                self.send_to(client, 'NICK'.encode('utf-8'))
                 nickname = client.recv(1024).decode('utf-8')
             except:
+                nickname = ''
+            self.timers.cancel(nickname_timer)
+            self.send_locks.pop(client, None)
+
+            if not nickname:
                 print("Cliente desconectou antes de enviar nickname.")
                 client.close()
                 continue
 
             self.nicknames.append(nickname)
             self.clients.append(client)
+            self.watch_connection(client)
 
             print(f"Nickname do cliente é {nickname}")
             player_id = len(self.clients) - 1
 
             # Envia ao cliente suas informações
-            client.send(json.dumps({
+            self.send_to(client, json.dumps({
                 'type': 'player_info',
                 'player_id': player_id,
                 'nickname': nickname
@@ -342,13 +840,6 @@ class SeegaServer:
                 }).encode('utf-8'))
                 self.broadcast_game_state()
 
-        # Mantém o servidor ativo até interrupção manual
-        try:
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("Servidor encerrado")
-            self.server.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,490 @@
+import argparse
+import importlib
+import importlib.util
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+
+
+def load_server_module():
+    """
+    Carrega o módulo do servidor (seega-server.py) para reutilizar as regras do jogo.
+    O nome do arquivo contém hífen, por isso não pode ser importado diretamente.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seega-server.py')
+    spec = importlib.util.spec_from_file_location('seega_server', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+seega_server = load_server_module()
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # direita, baixo, esquerda, cima
+
+
+class TournamentGame(seega_server.SeegaGame):
+    """
+    Partida de Seega entre bots, usando diretamente as regras do servidor.
+    """
+
+    def __init__(self, starter=0):
+        """
+        Inicializa uma partida em que starter joga primeiro.
+        """
+        super().__init__()
+        self.game_state['current_turn'] = starter
+
+    def legal_actions(self, player_id):
+        """
+        Lista as ações válidas do jogador, no mesmo formato das mensagens do cliente.
+        """
+        board = self.game_state['board']
+        actions = []
+
+        if self.game_state['phase'] == 'placement':
+            for row in range(5):
+                for col in range(5):
+                    if board[row][col] == 0 and (row, col) != (2, 2):
+                        actions.append({'type': 'place', 'row': row, 'col': col})
+            return actions
+
+        player_piece = player_id + 1
+        if self.forced_piece is not None:
+            origins = [self.forced_piece]
+        else:
+            origins = [(row, col) for row in range(5) for col in range(5) if board[row][col] == player_piece]
+
+        for from_row, from_col in origins:
+            for dr, dc in DIRECTIONS:
+                to_row = from_row + dr
+                to_col = from_col + dc
+                if 0 <= to_row < 5 and 0 <= to_col < 5 and board[to_row][to_col] == 0:
+                    actions.append({
+                        'type': 'move',
+                        'from_row': from_row,
+                        'from_col': from_col,
+                        'to_row': to_row,
+                        'to_col': to_col
+                    })
+
+        # Na fase de movimentação o jogador sempre pode passar o turno
+        actions.append({'type': 'pass'})
+        return actions
+
+
+def count_captures(board, action, player_piece):
+    """
+    Conta quantas peças um movimento capturaria, sem alterar o tabuleiro.
+    """
+    opponent_piece = 1 if player_piece == 2 else 2
+    to_row, to_col = action['to_row'], action['to_col']
+    captures = 0
+
+    for dr, dc in DIRECTIONS:
+        adj_row = to_row + dr
+        adj_col = to_col + dc
+        next_row = adj_row + dr
+        next_col = adj_col + dc
+        if not (0 <= next_row < 5 and 0 <= next_col < 5):
+            continue
+        if (adj_row, adj_col) == (2, 2):
+            continue  # Peça no centro não pode ser capturada
+        if board[adj_row][adj_col] != opponent_piece:
+            continue
+        # A casa de origem fica vazia depois do movimento
+        if (next_row, next_col) == (action['from_row'], action['from_col']):
+            continue
+        if board[next_row][next_col] == player_piece:
+            captures += 1
+
+    return captures
+
+
+def random_policy(game, player_id, actions, rng):
+    """
+    Escolhe uma ação aleatória, passando o turno apenas quando não há outra opção.
+    """
+    playable = [action for action in actions if action['type'] != 'pass']
+    if not playable:
+        return actions[-1]
+    return rng.choice(playable)
+
+
+def greedy_policy(game, player_id, actions, rng):
+    """
+    Escolhe o movimento que captura mais peças (desempate aleatório).
+    Com peça forçada e sem captura possível, passa o turno.
+    """
+    playable = [action for action in actions if action['type'] != 'pass']
+    if not playable:
+        return actions[-1]
+    if playable[0]['type'] == 'place':
+        return rng.choice(playable)
+
+    board = game.game_state['board']
+    player_piece = player_id + 1
+    scored = [(count_captures(board, action, player_piece), action) for action in playable]
+    best = max(score for score, _ in scored)
+
+    if best == 0 and game.forced_piece is not None:
+        return actions[-1]
+    return rng.choice([action for score, action in scored if score == best])
+
+
+BUILTIN_POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+}
+
+# Políticas já resolvidas em cada processo de trabalho
+_policy_cache = {}
+
+
+def resolve_policy(spec):
+    """
+    Converte a especificação de um motor em uma função.
+    Aceita um nome embutido ('random', 'greedy'), 'modulo:funcao' ou 'arquivo.py:funcao'.
+    """
+    if spec in _policy_cache:
+        return _policy_cache[spec]
+
+    if spec in BUILTIN_POLICIES:
+        policy = BUILTIN_POLICIES[spec]
+    else:
+        if ':' not in spec:
+            raise ValueError(f"Motor inválido: {spec}")
+        target, function_name = spec.rsplit(':', 1)
+        if target.endswith('.py'):
+            name = os.path.splitext(os.path.basename(target))[0].replace('-', '_')
+            module_spec = importlib.util.spec_from_file_location(name, target)
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+        else:
+            module = importlib.import_module(target)
+        policy = getattr(module, function_name)
+
+    _policy_cache[spec] = policy
+    return policy
+
+
+def play_game(task):
+    """
+    Joga uma partida completa entre dois motores e devolve o resultado.
+    Executado nos processos de trabalho.
+    """
+    rng = random.Random(task['seed'])
+    policies = [resolve_policy(spec) for spec in task['specs']]
+
+    # Escolhe aleatoriamente quem começa, como em SeegaServer.start
+    starter = rng.randint(0, 1)
+    game = TournamentGame(starter)
+
+    elapsed = [0.0, 0.0]
+    decisions = [0, 0]
+    plies = 0
+    reason = 'rules'
+
+    while not game.game_state['game_over']:
+        if plies >= task['max_plies']:
+            reason = 'max_plies'
+            break
+
+        player_id = game.game_state['current_turn']
+        actions = game.legal_actions(player_id)
+
+        started = time.perf_counter()
+        try:
+            action = policies[player_id](game, player_id, actions, rng)
+        except Exception as e:
+            action = None
+            reason = f"error: {e}"
+        elapsed[player_id] += time.perf_counter() - started
+        decisions[player_id] += 1
+
+        # Ação inválida ou erro do motor conta como derrota
+        if action not in actions:
+            if action is not None:
+                reason = 'illegal'
+            game.game_state['game_over'] = True
+            game.game_state['winner'] = 1 - player_id
+            break
+
+        game.apply_command(action, player_id)
+        plies += 1
+
+    return {
+        'game_id': task['game_id'],
+        'round': task['round'],
+        'players': task['players'],
+        'starter': starter,
+        'winner': game.game_state['winner'],
+        'captured': game.game_state['captured'],
+        'plies': plies,
+        'reason': reason,
+        'time': elapsed,
+        'decisions': decisions
+    }
+
+
+class Tournament:
+    """
+    Organiza partidas entre motores em rodízio (round-robin) ou sistema suíço.
+    As partidas rodam em paralelo e os resultados são gravados em um arquivo
+    JSON Lines, permitindo retomar o torneio após uma interrupção.
+    """
+
+    def __init__(self, engines, results_path, games_per_pair=2, seed=0, max_plies=400, workers=None):
+        """
+        Inicializa o torneio. engines é uma lista de pares (nome, especificação).
+        """
+        # Cada confronto joga o mesmo número de partidas com cada cor
+        if games_per_pair < 2 or games_per_pair % 2 != 0:
+            raise ValueError("games_per_pair deve ser par (cada motor joga com as duas cores)")
+
+        self.engines = dict(engines)
+        self.names = [name for name, _ in engines]
+        self.results_path = results_path
+        self.games_per_pair = games_per_pair
+        self.seed = seed
+        self.max_plies = max_plies
+        self.workers = workers or os.cpu_count() or 1
+
+        # Resultados já concluídos, indexados pelo id da partida
+        self.results = {}
+        # Emparelhamentos do sistema suíço já sorteados, por rodada
+        self.pairings = {}
+        # Partidas agendadas nesta execução; só elas entram na classificação
+        self.game_ids = set()
+        if os.path.exists(results_path):
+            with open(results_path, encoding='utf-8') as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        result = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Linha incompleta de uma execução interrompida
+                    if 'pairings' in result:
+                        self.pairings[result['round']] = [tuple(pair) for pair in result['pairings']]
+                    else:
+                        self.results[result['game_id']] = result
+
+    def make_tasks(self, round_number, pairings):
+        """
+        Cria as partidas de uma rodada, alternando as cores entre os motores.
+        """
+        tasks = []
+        for first, second in pairings:
+            for k in range(self.games_per_pair):
+                players = [first, second] if k % 2 == 0 else [second, first]
+                game_id = f"{round_number}:{first}:{second}:{k}"
+                self.game_ids.add(game_id)
+                tasks.append({
+                    'game_id': game_id,
+                    'round': round_number,
+                    'players': players,
+                    'specs': [self.engines[name] for name in players],
+                    'seed': random.Random(f"{self.seed}:{game_id}").getrandbits(64),
+                    'max_plies': self.max_plies
+                })
+        return tasks
+
+    def run_tasks(self, tasks, pool):
+        """
+        Executa as partidas pendentes e grava cada resultado assim que termina.
+        """
+        pending = [task for task in tasks if task['game_id'] not in self.results]
+        if not pending:
+            return
+
+        chunksize = max(1, len(pending) // (self.workers * 8))
+        with open(self.results_path, 'a', encoding='utf-8') as file:
+            for done, result in enumerate(pool.imap_unordered(play_game, pending, chunksize), 1):
+                self.results[result['game_id']] = result
+                file.write(json.dumps(result) + '\n')
+                file.flush()
+                if done % 100 == 0 or done == len(pending):
+                    print(f"{done}/{len(pending)} partidas concluídas")
+
+    def round_robin_pairings(self):
+        """
+        Todos contra todos.
+        """
+        return [(self.names[i], self.names[j])
+                for i in range(len(self.names))
+                for j in range(i + 1, len(self.names))]
+
+    def swiss_pairings(self, round_number):
+        """
+        Emparelha motores com pontuação parecida que ainda não se enfrentaram.
+        Com número ímpar de motores, o último colocado sem folga fica de fora da rodada.
+        Os emparelhamentos são gravados no arquivo de resultados, e uma execução
+        retomada reutiliza os da rodada em vez de sortear de novo.
+        """
+        if round_number in self.pairings:
+            return self.pairings[round_number]
+
+        # Apenas as rodadas anteriores contam para o emparelhamento
+        standings = self.standings(before_round=round_number)
+        played = set()
+        for previous in range(round_number):
+            played.update(frozenset(pair) for pair in self.pairings.get(previous, []))
+        byes = set()
+        for previous in range(round_number):
+            paired = {name for pair in self.pairings.get(previous, []) for name in pair}
+            byes.update(name for name in self.names if name not in paired)
+
+        ranking = sorted(self.names, key=lambda name: (-standings[name]['score'], name))
+        if len(ranking) % 2 == 1:
+            candidates = [name for name in reversed(ranking) if name not in byes] or list(reversed(ranking))
+            ranking.remove(candidates[0])
+
+        pairings = []
+        while ranking:
+            first = ranking.pop(0)
+            opponent = next((name for name in ranking if frozenset((first, name)) not in played), ranking[0])
+            ranking.remove(opponent)
+            pairings.append((first, opponent))
+
+        self.pairings[round_number] = pairings
+        with open(self.results_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({'round': round_number, 'pairings': pairings}) + '\n')
+        return pairings
+
+    def run(self, pairing='round-robin', rounds=None):
+        """
+        Executa o torneio completo. Partidas já gravadas no arquivo não são repetidas.
+        """
+        with multiprocessing.Pool(self.workers) as pool:
+            if pairing == 'round-robin':
+                self.run_tasks(self.make_tasks(0, self.round_robin_pairings()), pool)
+            else:
+                for round_number in range(rounds or len(self.names) - 1):
+                    print(f"Rodada {round_number + 1}")
+                    self.run_tasks(self.make_tasks(round_number, self.swiss_pairings(round_number)), pool)
+
+    def standings(self, before_round=None):
+        """
+        Calcula vitórias, empates, derrotas, pontuação e tempo de cada motor.
+        Com before_round, considera apenas as rodadas anteriores a ela.
+        """
+        table = {name: {'wins': 0, 'draws': 0, 'losses': 0, 'score': 0.0,
+                        'time': 0.0, 'decisions': 0} for name in self.names}
+
+        for result in self.results.values():
+            if self.game_ids and result['game_id'] not in self.game_ids:
+                continue  # Partida de outro emparelhamento gravada no mesmo arquivo
+            if before_round is not None and result['round'] >= before_round:
+                continue
+            for index, name in enumerate(result['players']):
+                if name not in table:
+                    continue
+                entry = table[name]
+                entry['time'] += result['time'][index]
+                entry['decisions'] += result['decisions'][index]
+                if result['winner'] is None:
+                    entry['draws'] += 1
+                    entry['score'] += 0.5
+                elif result['winner'] == index:
+                    entry['wins'] += 1
+                    entry['score'] += 1
+                else:
+                    entry['losses'] += 1
+
+        for entry in table.values():
+            games = entry['wins'] + entry['draws'] + entry['losses']
+            entry['games'] = games
+            entry['win_rate'] = entry['wins'] / games if games else 0.0
+            entry['elo'], entry['elo_margin'] = elo_estimate(entry['wins'], entry['draws'], entry['losses'])
+
+        return table
+
+    def report(self):
+        """
+        Imprime a classificação do torneio.
+        """
+        table = self.standings()
+        ranking = sorted(self.names, key=lambda name: (-table[name]['score'], name))
+
+        print(f"{'Motor':<16}{'Jogos':>7}{'V':>6}{'E':>6}{'D':>6}{'Vitórias':>10}"
+              f"{'Elo':>9}{'±95%':>8}{'Tempo (s)':>11}{'ms/jogada':>11}")
+        for name in ranking:
+            entry = table[name]
+            per_move = 1000 * entry['time'] / entry['decisions'] if entry['decisions'] else 0.0
+            print(f"{name:<16}{entry['games']:>7}{entry['wins']:>6}{entry['draws']:>6}{entry['losses']:>6}"
+                  f"{entry['win_rate']:>10.1%}{entry['elo']:>9.1f}{entry['elo_margin']:>8.1f}"
+                  f"{entry['time']:>11.2f}{per_move:>11.3f}")
+
+
+def elo_difference(score):
+    """
+    Diferença de Elo correspondente a uma pontuação média (entre 0 e 1).
+    """
+    return 400 * math.log10(score / (1 - score))
+
+
+def elo_estimate(wins, draws, losses):
+    """
+    Estima o Elo de um motor contra a média dos adversários e a margem
+    do intervalo de confiança de 95% (intervalo de Wilson sobre a pontuação).
+    """
+    games = wins + draws + losses
+    if games == 0:
+        return 0.0, 0.0
+
+    # Um empate virtual mantém a pontuação longe de 0% e 100%, onde o Elo seria infinito
+    games += 1
+    score = (wins + 0.5 * (draws + 1)) / games
+
+    z = 1.96
+    denominator = 1 + z ** 2 / games
+    center = (score + z ** 2 / (2 * games)) / denominator
+    half_width = z * math.sqrt(score * (1 - score) / games + z ** 2 / (4 * games ** 2)) / denominator
+
+    low = elo_difference(center - half_width)
+    high = elo_difference(center + half_width)
+    return elo_difference(score), (high - low) / 2
+
+
+def parse_engine(argument):
+    """
+    Interpreta 'nome=especificação' ou apenas 'especificação'.
+    """
+    if '=' in argument:
+        name, spec = argument.split('=', 1)
+    else:
+        name, spec = argument, argument
+    return name, spec
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Torneio de bots de Seega")
+    parser.add_argument('engines', nargs='+', type=parse_engine,
+                        help="motores: random, greedy, modulo:funcao ou arquivo.py:funcao (opcional: nome=...)")
+    parser.add_argument('--pairing', choices=['round-robin', 'swiss'], default='round-robin')
+    parser.add_argument('--rounds', type=int, default=None, help="rodadas do sistema suíço")
+    parser.add_argument('--games', type=int, default=2, help="partidas por confronto, número par (alternando cores)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-plies', type=int, default=400, help="jogadas até declarar empate")
+    parser.add_argument('--results', default='tournament-results.jsonl')
+    args = parser.parse_args()
+
+    names = [name for name, _ in args.engines]
+    if len(set(names)) != len(names):
+        parser.error("nomes de motores repetidos")
+    if args.games < 2 or args.games % 2 != 0:
+        parser.error("--games deve ser um número par")
+
+    tournament = Tournament(args.engines, args.results, games_per_pair=args.games,
+                            seed=args.seed, max_plies=args.max_plies, workers=args.workers)
+    try:
+        tournament.run(args.pairing, args.rounds)
+    except KeyboardInterrupt:
+        print("Torneio interrompido; execute novamente para continuar")
+    tournament.report()
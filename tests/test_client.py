@@ -0,0 +1,244 @@
+import copy
+import importlib.util
+import json
+import os
+import random
+
+import pytest
+
+pytest.importorskip('tkinter')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module')
+def seega_client():
+    return load_module('seega_client', 'seega-client.py')
+
+
+@pytest.fixture(scope='module')
+def seega_server():
+    return load_module('seega_server', 'seega-server.py')
+
+
+class FakeRoot:
+    """
+    Substitui a janela do Tkinter: guarda os callbacks agendados com root.after.
+    """
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback, *args):
+        self.scheduled.append((ms, callback, args))
+
+    def run_expired(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for _, callback, args in scheduled:
+            callback(*args)
+
+
+@pytest.fixture
+def client(seega_client, seega_server):
+    """
+    Cliente sem janela nem socket: os estados mostrados e os comandos enviados ficam em listas.
+    """
+    client = seega_client.SeegaClient.__new__(seega_client.SeegaClient)
+    client.player_id = 0
+    client.nickname = 'a'
+    client.selected_piece = None
+    client.pending_commands = []
+    client.rolled_back = {}
+    client.next_command_id = 0
+    client.forced_piece = None
+    client.confirmed_forced_piece = None
+    client.PREDICTION_TIMEOUT_MS = 3000
+    client.root = FakeRoot()
+
+    client.shown = []
+    client.sent = []
+    client.system_messages = []
+    client.update_game_state = lambda state: (setattr(client, 'game_state', state), client.shown.append(state))
+    client.send_message = lambda message: client.sent.append(json.loads(message.decode('utf-8')))
+    client.add_system_message = client.system_messages.append
+
+    state = seega_server.SeegaGame().game_state
+    client.server_state = state
+    client.game_state = state
+    return client
+
+
+def predict(client, command):
+    """
+    Previsão do cliente para o comando: (estado, peça forçada) ou None se inválido.
+    """
+    if command['type'] == 'place':
+        predicted = client.predict_placement(command['row'], command['col'])
+        return None if predicted is None else (predicted, None)
+    return client.predict_move(command['from_row'], command['from_col'],
+                               command['to_row'], command['to_col'])
+
+
+def random_command(game, rng):
+    """
+    Comando aleatório do jogador da vez; cerca de metade dos movimentos é inválida.
+    """
+    if game.game_state['phase'] == 'placement':
+        return {'type': 'place', 'row': rng.randrange(5), 'col': rng.randrange(5)}
+
+    player_piece = game.game_state['current_turn'] + 1
+    pieces = [(row, col) for row in range(5) for col in range(5)
+              if game.game_state['board'][row][col] == player_piece]
+    from_row, from_col = game.forced_piece or rng.choice(pieces)
+    if rng.random() < 0.2:
+        from_row, from_col = rng.randrange(5), rng.randrange(5)
+    dr, dc = rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1)])
+    to_row, to_col = from_row + dr, from_col + dc
+    if not (0 <= to_row < 5 and 0 <= to_col < 5):
+        to_row, to_col = from_row, from_col
+    return {'type': 'move', 'from_row': from_row, 'from_col': from_col, 'to_row': to_row, 'to_col': to_col}
+
+
+def test_predictions_match_server_rules(client, seega_server):
+    rng = random.Random(1)
+    seen = {'capture': 0, 'forced_rejected': 0, 'movement': 0, 'game_over': 0}
+
+    for _ in range(200):
+        game = seega_server.SeegaGame()
+        game.game_state['current_turn'] = rng.randint(0, 1)
+
+        for _ in range(400):
+            if game.game_state['game_over']:
+                seen['game_over'] += 1
+                break
+
+            # O cliente do jogador da vez vê o mesmo estado que o servidor
+            client.player_id = game.game_state['current_turn']
+            client.game_state = copy.deepcopy(game.game_state)
+            client.forced_piece = game.forced_piece
+            phase = game.game_state['phase']
+
+            command = random_command(game, rng)
+            prediction = predict(client, command)
+            reason = game.apply_command(command, client.player_id)
+
+            if reason is None:
+                assert prediction == (game.game_state, game.forced_piece)
+            else:
+                assert prediction is None, reason
+                seen['forced_rejected'] += reason == 'forced_piece'
+
+            seen['capture'] += reason is None and game.forced_piece is not None
+            seen['movement'] += phase == 'placement' and game.game_state['phase'] == 'movement'
+
+    # A comparação passou por capturas, peça forçada, troca de fase e fim de jogo
+    assert all(seen.values()), seen
+
+
+def test_prediction_of_capture_that_ends_game(client):
+    board = [[0] * 5 for _ in range(5)]
+    board[0][0] = 1
+    board[0][2] = 2
+    board[0][3] = 1
+    client.game_state.update(board=board, phase='movement', pieces_placed=[12, 12])
+
+    predicted, forced_piece = client.predict_move(0, 0, 0, 1)
+
+    assert predicted['board'][0][:4] == [0, 1, 0, 1]
+    assert predicted['captured'] == [1, 0]
+    assert predicted['game_over'] is True
+    assert predicted['winner'] == 0
+    assert forced_piece == (0, 1)
+
+
+def place(client, row, col):
+    client.send_place_command(row, col)
+    return client.sent[-1]['id']
+
+
+def test_ack_confirms_pending_predictions_in_order(client):
+    first = place(client, 0, 0)
+    second = place(client, 0, 1)
+    assert client.game_state['pieces_placed'] == [2, 0]
+
+    # O ack do segundo comando também confirma o primeiro
+    client.confirm_prediction(second)
+    client.confirm_prediction(first)
+
+    assert client.pending_commands == []
+    assert client.rolled_back == {}
+
+
+def test_reject_rolls_back_to_server_state(client):
+    server_state = client.server_state
+    first = place(client, 0, 0)
+    second = place(client, 0, 1)
+
+    client.reject_prediction(first, 'occupied')
+
+    assert client.game_state is server_state
+    assert client.pending_commands == []
+    assert list(client.rolled_back) == [second]
+    assert len(client.system_messages) == 1
+
+    # O reject atrasado do comando que dependia do recusado não repete o rollback
+    client.reject_prediction(second, 'not_your_turn')
+    assert client.rolled_back == {}
+    assert len(client.system_messages) == 1
+
+
+def test_timeout_rolls_back_and_late_ack_still_confirms(client):
+    board = [[0] * 5 for _ in range(5)]
+    board[0][0] = 1
+    board[0][2] = 2
+    board[0][3] = 1
+    board[4][4] = 2
+    client.game_state.update(board=board, phase='movement', pieces_placed=[12, 12])
+
+    client.send_move_command(0, 0, 0, 1)
+    command_id = client.sent[-1]['id']
+    assert client.forced_piece == (0, 1)
+
+    # Sem resposta do servidor a tempo: o expire agendado desfaz a previsão
+    client.root.run_expired()
+    assert client.pending_commands == []
+    assert client.forced_piece is None
+    assert client.game_state['board'][0][:4] == [1, 0, 2, 1]
+
+    # O ack que chega depois do timeout traz de volta a peça forçada da previsão confirmada
+    client.confirm_prediction(command_id)
+    assert client.rolled_back == {}
+    assert client.forced_piece == (0, 1)
+
+
+def test_state_from_server_waits_for_pending_predictions(client):
+    first = place(client, 0, 0)
+    predicted = client.game_state
+    server_state = copy.deepcopy(client.server_state)
+    server_state['board'][4][4] = 2
+
+    client.reconcile_game_state(server_state)
+    assert client.game_state is predicted
+
+    client.confirm_prediction(first)
+    client.reconcile_game_state(predicted)
+    assert client.game_state is predicted
+    assert client.server_state is predicted
+
+
+def test_unknown_ack_and_reject_are_ignored(client):
+    place(client, 0, 0)
+    predicted = client.game_state
+
+    client.confirm_prediction(99)
+    client.reject_prediction(99, 'occupied')
+
+    assert client.game_state is predicted
+    assert len(client.pending_commands) == 1
@@ -0,0 +1,359 @@
+import importlib.util
+import json
+import os
+import socket
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def seega_server():
+    spec = importlib.util.spec_from_file_location('seega_server', os.path.join(ROOT, 'seega-server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def game(seega_server):
+    return seega_server.SeegaGame()
+
+
+class FakeClient:
+    """
+    Conexão falsa que guarda as mensagens enviadas pelo servidor.
+    """
+
+    def __init__(self):
+        self.sent = []
+
+    def sendall(self, message):
+        self.sent.append(json.loads(message.decode('utf-8')))
+
+    def shutdown(self, how):
+        pass
+
+    def settimeout(self, timeout):
+        pass
+
+    def messages(self, message_type):
+        return [message for message in self.sent if message['type'] == message_type]
+
+
+@pytest.fixture
+def server(seega_server):
+    # Porta 0: o sistema escolhe uma porta livre; nenhuma conexão é aceita nos testes
+    server = seega_server.SeegaServer(port=0)
+    server.clients = [FakeClient(), FakeClient()]
+    server.nicknames = ['a', 'b']
+    yield server
+    server.server.close()
+
+
+@pytest.mark.parametrize('bad', [
+    {'type': 'place', 'col': 1},
+    {'type': 'place', 'row': '0', 'col': 1},
+    {'type': 'place', 'row': 0.5, 'col': 1},
+    {'type': 'place', 'row': True, 'col': 1},
+    ['place', 0, 1],
+])
+def test_malformed_command_rejects_whole_batch(game, bad):
+    reason, results = game.apply_batch([{'type': 'place', 'row': 0, 'col': 0, 'id': 1}, bad], 0)
+
+    assert reason == 'malformed'
+    assert [result['status'] for result in results] == ['rejected', 'rejected']
+    assert game.game_state['board'][0][0] == 0
+    assert game.placement_counter == 0
+
+
+def test_malformed_single_command_is_rejected(game):
+    assert game.apply_command({'type': 'move', 'from_row': 0}, 0) == 'malformed'
+    assert game.apply_command({'type': 'jump'}, 0) == 'unknown_command'
+    assert game.apply_command('place', 0) == 'malformed'
+
+
+def test_batch_must_be_a_list(game):
+    assert game.apply_batch(None, 0) == ('malformed', [])
+
+
+def test_empty_batch_is_rejected(game):
+    assert game.apply_batch([], 0) == ('malformed', [])
+    assert game.apply_batch([], 1) == ('malformed', [])
+
+
+def test_surrender_is_acked(server):
+    client = server.clients[1]
+    server.handle_message(client, 'b', 1, {'type': 'surrender', 'id': 3})
+
+    assert client.messages('ack') == [{'type': 'ack', 'id': 3}]
+    assert server.game_state['winner'] == 0
+
+    server.handle_message(client, 'b', 1, {'type': 'surrender', 'id': 4})
+    assert client.messages('reject')[-1] == {'type': 'reject', 'id': 4, 'reason': 'game_over'}
+
+
+def test_unknown_message_type_is_rejected(server):
+    client = server.clients[0]
+    server.handle_message(client, 'a', 0, {'type': 'foo', 'id': 8})
+    server.handle_message(client, 'a', 0, {'type': 'chat', 'id': 9})
+    server.handle_message(client, 'a', 0, {'type': 'pong'})
+
+    assert client.sent == [
+        {'type': 'reject', 'id': 8, 'reason': 'unknown_command'},
+        {'type': 'reject', 'id': 9, 'reason': 'malformed'},
+    ]
+
+
+@pytest.mark.parametrize('text, expected, rest', [
+    ('{"type": "pass"}{"type": "chat"', [{'type': 'pass'}], '{"type": "chat"'),
+    ('{"type": "place", "row": 1', [], '{"type": "place", "row": 1'),
+    ('{"type": "chat", "message": "ol', [], '{"type": "chat", "message": "ol'),
+    ('{"flag": tr', [], '{"flag": tr'),
+    ('hello{"type": "pass"}', [None, {'type': 'pass'}], ''),
+    ('{bad}{"type": "pass"}', [None, {'type': 'pass'}], ''),
+    ('garbage', [None], ''),
+])
+def test_decode_messages(seega_server, text, expected, rest):
+    assert seega_server.decode_messages(text) == (expected, rest)
+
+
+def movement_board(game):
+    """
+    Tabuleiro na fase de movimentação em que o jogador 0 captura movendo (0, 0) para (0, 1).
+    """
+    board = [[0] * 5 for _ in range(5)]
+    board[0][0] = 1
+    board[0][2] = 2
+    board[0][3] = 1
+    board[4][0] = 1
+    board[4][4] = 2
+    game.game_state['board'] = board
+    game.game_state['phase'] = 'movement'
+    game.game_state['pieces_placed'] = [12, 12]
+    game.game_state['current_turn'] = 0
+
+
+def test_replies_carry_request_id_and_reason(server):
+    server.game_state['current_turn'] = 0
+    first, second = server.clients
+
+    server.handle_message(second, 'b', 1, {'type': 'place', 'row': 0, 'col': 0, 'id': 'x1'})
+    server.handle_message(first, 'a', 0, {'type': 'place', 'row': 0, 'col': 0, 'id': 'x2'})
+    server.handle_message(first, 'a', 0, {'type': 'place', 'row': 0, 'col': 0, 'id': 'x3'})
+
+    assert second.messages('reject') == [{'type': 'reject', 'id': 'x1', 'reason': 'not_your_turn'}]
+    assert first.messages('ack') == [{'type': 'ack', 'id': 'x2'}]
+    assert first.messages('reject') == [{'type': 'reject', 'id': 'x3', 'reason': 'occupied'}]
+
+    movement_board(server)
+    server.handle_message(first, 'a', 0, {'type': 'move', 'from_row': 0, 'from_col': 0,
+                                          'to_row': 1, 'to_col': 1, 'id': 'x4'})
+    assert first.messages('reject')[-1] == {'type': 'reject', 'id': 'x4', 'reason': 'invalid_move'}
+
+
+def test_accepted_batch_broadcasts_state_once(server):
+    server.game_state['current_turn'] = 0
+    first, second = server.clients
+
+    server.handle_message(first, 'a', 0, {'type': 'batch', 'id': 'b', 'commands': [
+        {'type': 'place', 'row': 0, 'col': 0, 'id': 1},
+        {'type': 'place', 'row': 0, 'col': 1, 'id': 2},
+    ]})
+
+    assert first.messages('ack') == [{'type': 'ack', 'id': 'b', 'results': [
+        {'id': 1, 'status': 'ok'}, {'id': 2, 'status': 'ok'}]}]
+    assert len(first.messages('game_state')) == 1
+    assert len(second.messages('game_state')) == 1
+    assert server.game_state['current_turn'] == 1
+
+
+def test_rejected_batch_sends_no_state(server):
+    server.game_state['current_turn'] = 0
+    first, second = server.clients
+
+    server.handle_message(first, 'a', 0, {'type': 'batch', 'id': 'b', 'commands': [
+        {'type': 'place', 'row': 0, 'col': 0}, {'type': 'place', 'row': 0, 'col': 0}]})
+
+    assert first.messages('reject')[0]['reason'] == 'occupied'
+    assert first.messages('game_state') == second.messages('game_state') == []
+
+
+def test_failed_batch_restores_placement_counter(game):
+    game.game_state['current_turn'] = 0
+    reason, _ = game.apply_batch([{'type': 'place', 'row': 0, 'col': 0},
+                                  {'type': 'place', 'row': 0, 'col': 0}], 0)
+
+    assert reason == 'occupied'
+    assert game.placement_counter == 0
+    assert game.game_state['pieces_placed'] == [0, 0]
+
+
+def test_failed_batch_restores_forced_piece(game):
+    movement_board(game)
+    reason, results = game.apply_batch([
+        {'type': 'move', 'from_row': 0, 'from_col': 0, 'to_row': 0, 'to_col': 1},
+        {'type': 'move', 'from_row': 4, 'from_col': 0, 'to_row': 3, 'to_col': 0},
+    ], 0)
+
+    assert reason == 'forced_piece'
+    assert [result['reason'] for result in results] == ['batch_aborted', 'forced_piece']
+    assert game.forced_piece is None
+    assert game.game_state['board'][0][:4] == [1, 0, 2, 1]
+    assert game.game_state['captured'] == [0, 0]
+
+
+def test_turn_clock_restarts_only_on_state_change(server):
+    server.game_state['current_turn'] = 0
+    first, second = server.clients
+    server.broadcast_game_state()
+    generation = server.turn_clock_generation
+    server.timeouts = [2, 2]
+
+    # Comandos recusados e mensagens sem efeito não reiniciam o relógio
+    server.handle_message(first, 'a', 0, {'type': 'batch', 'commands': []})
+    server.handle_message(second, 'b', 1, {'type': 'place', 'row': 0, 'col': 0})
+    server.handle_message(first, 'a', 0, {'type': 'chat', 'message': 'oi'})
+    server.broadcast_game_state()
+    assert server.turn_clock_generation == generation
+    assert server.timeouts == [2, 2]
+
+    server.handle_message(first, 'a', 0, {'type': 'place', 'row': 0, 'col': 0})
+    assert server.turn_clock_generation == generation + 1
+    assert server.timeouts == [0, 2]
+
+
+def test_send_to_peer_that_stops_reading_times_out(server):
+    local, peer = socket.socketpair()
+    server.SEND_TIMEOUT = 0.2
+    server.watch_connection(local)
+    try:
+        started = time.monotonic()
+        with pytest.raises(socket.timeout):
+            # O peer nunca lê: o buffer do socket enche e o envio expira
+            for _ in range(1000):
+                server.send_to(local, b'x' * 65536)
+        assert time.monotonic() - started < 5
+
+        # A conexão foi encerrada: o peer recebe EOF depois dos dados pendentes
+        peer.settimeout(1)
+        while peer.recv(65536):
+            pass
+    finally:
+        server.unwatch_connection(local)
+        local.close()
+        peer.close()
+
+
+@pytest.fixture
+def wheel(seega_server):
+    # Roda pequena para que poucos ticks atravessem todos os níveis
+    return seega_server.TimerWheel(tick=1, slots=4, levels=3)
+
+
+def advance_until(wheel, tick):
+    while wheel.current_tick < tick:
+        wheel.advance()
+
+
+def test_timers_fire_on_their_tick_across_levels(wheel):
+    fired = []
+    delays = [1, 3, 4, 5, 15, 16, 17, 40, 63]
+    for delay in delays:
+        wheel.schedule(delay, lambda delay=delay: fired.append((delay, wheel.current_tick)))
+
+    advance_until(wheel, 70)
+
+    assert fired == [(delay, delay) for delay in delays]
+
+
+def test_timer_scheduled_after_start_fires_on_its_tick(wheel):
+    fired = []
+    advance_until(wheel, 7)
+    wheel.schedule(22, lambda: fired.append(wheel.current_tick))
+
+    advance_until(wheel, 40)
+
+    assert fired == [29]
+
+
+def test_cancelled_timer_does_not_fire(wheel):
+    fired = []
+    near = wheel.schedule(2, fired.append, 'near')
+    far = wheel.schedule(20, fired.append, 'far')
+    wheel.schedule(21, fired.append, 'kept')
+    wheel.cancel(near)
+    advance_until(wheel, 17)
+    # Cancelar depois de o temporizador descer de nível também funciona
+    wheel.cancel(far)
+
+    advance_until(wheel, 30)
+
+    assert fired == ['kept']
+
+
+def test_turn_timeout_passes_turn_in_movement(server):
+    movement_board(server)
+    server.forced_piece = (0, 1)
+    server.broadcast_game_state()
+
+    server.turn_timeout(0, server.turn_clock_generation)
+
+    assert server.game_state['current_turn'] == 1
+    assert server.game_state['game_over'] is False
+    assert server.forced_piece is None
+    assert server.timeouts == [1, 0]
+
+
+def test_turn_timeout_forfeits_in_placement(server):
+    server.game_state['current_turn'] = 0
+    server.broadcast_game_state()
+
+    server.turn_timeout(0, server.turn_clock_generation)
+
+    assert server.game_state['game_over'] is True
+    assert server.game_state['winner'] == 1
+
+
+def test_third_consecutive_timeout_forfeits(server):
+    movement_board(server)
+    server.broadcast_game_state()
+
+    for _ in range(2):
+        server.turn_timeout(0, server.turn_clock_generation)
+        server.turn_timeout(1, server.turn_clock_generation)
+    assert server.game_state['game_over'] is False
+    assert server.timeouts == [2, 2]
+
+    server.turn_timeout(0, server.turn_clock_generation)
+
+    assert server.game_state['game_over'] is True
+    assert server.game_state['winner'] == 1
+
+
+def test_move_resets_consecutive_timeouts(server):
+    movement_board(server)
+    server.broadcast_game_state()
+    server.turn_timeout(0, server.turn_clock_generation)
+    server.turn_timeout(1, server.turn_clock_generation)
+
+    server.handle_message(server.clients[0], 'a', 0, {'type': 'move', 'from_row': 4, 'from_col': 0,
+                                                      'to_row': 3, 'to_col': 0})
+
+    assert server.timeouts == [0, 1]
+
+
+def test_stale_turn_timeout_is_ignored(server):
+    server.game_state['current_turn'] = 0
+    server.broadcast_game_state()
+    stale = server.turn_clock_generation
+    server.handle_message(server.clients[0], 'a', 0, {'type': 'place', 'row': 0, 'col': 0})
+    sent = [len(client.sent) for client in server.clients]
+
+    server.turn_timeout(0, stale)
+
+    assert server.game_state['game_over'] is False
+    assert server.timeouts == [0, 0]
+    assert [len(client.sent) for client in server.clients] == sent
@@ -0,0 +1,82 @@
+import importlib.util
+import math
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def tournament_module():
+    spec = importlib.util.spec_from_file_location('seega_tournament', os.path.join(ROOT, 'seega-tournament.py'))
+    module = importlib.util.module_from_spec(spec)
+    # Os processos de trabalho precisam encontrar play_game pelo nome do módulo
+    sys.modules['seega_tournament'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def count_lines(path):
+    with open(path, encoding='utf-8') as file:
+        return sum(1 for line in file if line.strip())
+
+
+def test_swiss_resume_does_not_replay_games(tournament_module, tmp_path):
+    results = str(tmp_path / 'results.jsonl')
+    engines = [('a', 'random'), ('b', 'greedy'), ('c', 'greedy'), ('d', 'random')]
+
+    first = tournament_module.Tournament(engines, results, games_per_pair=4, workers=1)
+    first.run('swiss', rounds=3)
+    lines = count_lines(results)
+    table = first.standings()
+
+    second = tournament_module.Tournament(engines, results, games_per_pair=4, workers=1)
+    second.run('swiss', rounds=3)
+
+    assert count_lines(results) == lines
+    assert second.pairings == first.pairings
+    assert second.standings() == table
+    assert sum(entry['games'] for entry in table.values()) == 3 * 2 * 4 * 2
+
+
+def test_swiss_resume_after_partial_run(tournament_module, tmp_path):
+    results = str(tmp_path / 'results.jsonl')
+    engines = [('a', 'random'), ('b', 'greedy'), ('c', 'greedy'), ('d', 'random')]
+
+    tournament_module.Tournament(engines, results, games_per_pair=2, workers=1).run('swiss', rounds=1)
+    resumed = tournament_module.Tournament(engines, results, games_per_pair=2, workers=1)
+    resumed.run('swiss', rounds=3)
+
+    table = resumed.standings()
+    assert sum(entry['games'] for entry in table.values()) == 3 * 2 * 2 * 2
+    assert count_lines(results) == 3 + 3 * 2 * 2
+
+
+@pytest.mark.parametrize('wins, draws, losses', [(10, 0, 0), (0, 0, 10), (0, 10, 0), (1, 0, 0)])
+def test_elo_margin_does_not_collapse(tournament_module, wins, draws, losses):
+    elo, margin = tournament_module.elo_estimate(wins, draws, losses)
+
+    assert math.isfinite(elo)
+    assert math.isfinite(margin) and margin > 0
+
+
+def test_elo_is_symmetric(tournament_module):
+    assert tournament_module.elo_estimate(5, 0, 5)[0] == 0
+    assert tournament_module.elo_estimate(7, 2, 1)[0] == pytest.approx(-tournament_module.elo_estimate(1, 2, 7)[0])
+
+
+@pytest.mark.parametrize('games', [0, 1, 3])
+def test_games_per_pair_must_balance_colors(tournament_module, tmp_path, games):
+    with pytest.raises(ValueError):
+        tournament_module.Tournament([('a', 'random'), ('b', 'greedy')], str(tmp_path / 'results.jsonl'),
+                                     games_per_pair=games)
+
+
+def test_each_pairing_plays_both_colors(tournament_module, tmp_path):
+    tournament = tournament_module.Tournament([('a', 'random'), ('b', 'greedy')], str(tmp_path / 'results.jsonl'),
+                                              games_per_pair=4)
+    tasks = tournament.make_tasks(0, tournament.round_robin_pairings())
+
+    assert sorted(task['players'][0] for task in tasks) == ['a', 'a', 'b', 'b']